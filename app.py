@@ -1,6 +1,8 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from datetime import date
+from types import SimpleNamespace
 
 # -------------------------------------------------------------------
 # CONFIGURAÇÕES GERAIS
@@ -14,8 +16,19 @@ st.set_page_config(
 # -------------------------------------------------------------------
 # INICIALIZAÇÃO DO ESTADO
 # -------------------------------------------------------------------
-def init_plano_contas():
-    """Cria um plano de contas padrão se ainda não existir."""
+GRUPOS = [
+    "Ativo",
+    "Passivo",
+    "Patrimônio Líquido",
+    "Resultado - Receita",
+    "Resultado - Despesa",
+]
+NATUREZAS = ["Devedora", "Credora"]
+CONTA_NAO_CADASTRADA = "Conta não cadastrada"
+
+
+def _monta_plano_padrao() -> pd.DataFrame:
+    """Monta o plano de contas padrão já com os tipos de cada coluna."""
     dados = [
         # código, nome, grupo, natureza, é caixa?
         ("1.1.1", "Caixa", "Ativo", "Devedora", True),
@@ -36,140 +49,275 @@ def init_plano_contas():
         ("4.1.3", "Despesas Administrativas", "Resultado - Despesa", "Devedora", False),
         ("4.1.4", "Despesas Financeiras", "Resultado - Despesa", "Devedora", False),
     ]
-    df = pd.DataFrame(
-        dados,
-        columns=["codigo", "conta", "grupo", "natureza", "eh_caixa"],
+    codigos, contas, grupos, naturezas, eh_caixa = zip(*dados)
+    return pd.DataFrame(
+        {
+            "codigo": pd.array(codigos, dtype="string"),
+            "conta": pd.array(contas, dtype="string"),
+            # Domínios fixos como categorias (também viram listas de seleção no editor)
+            "grupo": pd.Categorical(grupos, categories=GRUPOS),
+            "natureza": pd.Categorical(naturezas, categories=NATUREZAS),
+            "eh_caixa": np.array(eh_caixa, dtype=bool),
+        }
     )
-    return df
+
+
+# Montado uma única vez na importação
+PLANO_CONTAS_PADRAO = _monta_plano_padrao()
+
+
+def init_plano_contas():
+    """Cria um plano de contas padrão se ainda não existir."""
+    return PLANO_CONTAS_PADRAO.copy()
 
 
 if "plano_contas" not in st.session_state:
     st.session_state["plano_contas"] = init_plano_contas()
 
-if "lancamentos" not in st.session_state:
-    st.session_state["lancamentos"] = pd.DataFrame(
-        columns=[
-            "data",
-            "historico",
-            "conta_debito",
-            "conta_credito",
-            "valor",
-        ]
+COLUNAS_LANCAMENTOS = [
+    "data",
+    "historico",
+    "conta_debito",
+    "conta_credito",
+    "valor",
+]
+
+if "lancamentos_rows" not in st.session_state:
+    st.session_state["lancamentos_rows"] = []
+
+# Incrementado a cada edição do plano; invalida o índice de códigos da sessão
+if "plano_version" not in st.session_state:
+    st.session_state["plano_version"] = 0
+
+
+def get_lancamentos_df() -> pd.DataFrame:
+    """Materializa os lançamentos da sessão como DataFrame."""
+    df = pd.DataFrame(
+        st.session_state["lancamentos_rows"],
+        columns=COLUNAS_LANCAMENTOS,
+    )
+    # Contas como categorias sobre os códigos do plano de contas e os já lançados,
+    # para que códigos removidos ou renomeados no plano continuem visíveis
+    codigos = pd.CategoricalDtype(
+        categories=pd.concat(
+            [
+                st.session_state["plano_contas"]["codigo"].astype(object),
+                df["conta_debito"],
+                df["conta_credito"],
+            ]
+        ).dropna().unique()
     )
+    df["conta_debito"] = df["conta_debito"].astype(codigos)
+    df["conta_credito"] = df["conta_credito"].astype(codigos)
+    return df
+
+
+def monta_indice_codigos(plano_contas: pd.DataFrame) -> dict:
+    """Retorna dicionário código -> posição da primeira conta com esse código."""
+    indice = {}
+    for i, codigo in enumerate(plano_contas["codigo"]):
+        if not pd.isna(codigo):
+            indice.setdefault(codigo, i)
+    return indice
+
+
+def get_indice_codigos() -> dict:
+    """Retorna o índice de códigos do plano da sessão, refeito só quando o plano muda."""
+    versao = st.session_state["plano_version"]
+    if st.session_state.get("indice_codigos_version") != versao:
+        st.session_state["indice_codigos"] = monta_indice_codigos(
+            st.session_state["plano_contas"]
+        )
+        st.session_state["indice_codigos_version"] = versao
+    return st.session_state["indice_codigos"]
+
 
 # -------------------------------------------------------------------
 # FUNÇÕES DE CÁLCULO
 # -------------------------------------------------------------------
-def calcula_balancete(plano_contas: pd.DataFrame, lancamentos: pd.DataFrame) -> pd.DataFrame:
-    """Retorna balancete de verificação a partir dos lançamentos."""
+@st.cache_data(show_spinner=False)
+def mapa_conta_por_codigo(plano_contas: pd.DataFrame) -> dict:
+    """Retorna dicionário código -> nome da conta do plano de contas.
+
+    Para códigos repetidos, vale o nome da primeira conta com aquele código.
+    """
+    unicos = plano_contas.dropna(subset=["codigo"]).drop_duplicates("codigo")
+    return dict(zip(unicos["codigo"], unicos["conta"]))
+
+
+def posicoes_no_plano(contas: pd.Series, indice_codigos: dict) -> np.ndarray:
+    """Retorna a posição no plano de cada conta (-1 se não cadastrada)."""
+    # Resolve a posição de cada categoria uma vez e expande pelos códigos inteiros
+    contas = contas.astype("category")
+    pos_categoria = np.array(
+        [indice_codigos.get(c, -1) for c in contas.cat.categories] + [-1],
+        dtype=np.intp,
+    )
+    return pos_categoria[contas.cat.codes.to_numpy()]
+
+
+def acumula_por_conta(
+    contas: pd.Series, valores: np.ndarray, indice_codigos: dict, n_contas: int
+) -> np.ndarray:
+    """Soma os valores por conta, alinhado às posições do plano de contas."""
+    idx = posicoes_no_plano(contas, indice_codigos)
+    validos = idx >= 0
+    return np.bincount(idx[validos], weights=valores[validos], minlength=n_contas)
+
+
+def calcula_balancete(
+    plano_contas: pd.DataFrame, lancamentos: pd.DataFrame, indice_codigos: dict
+) -> tuple:
+    """Retorna balancete de verificação e os totais de débitos e créditos."""
     bal = plano_contas.copy().reset_index(drop=True)
-    bal["debito"] = 0.0
-    bal["credito"] = 0.0
 
     # Soma débitos e créditos por conta
-    for _, l in lancamentos.iterrows():
-        mask_d = bal["codigo"] == l["conta_debito"]
-        mask_c = bal["codigo"] == l["conta_credito"]
-        bal.loc[mask_d, "debito"] += l["valor"]
-        bal.loc[mask_c, "credito"] += l["valor"]
+    valores = lancamentos["valor"].to_numpy(dtype=np.float64)
+    # Cada linha do plano lê o total da primeira conta com o mesmo código;
+    # códigos repetidos recebem todos o mesmo total, como no cálculo por máscara
+    pos_plano = posicoes_no_plano(bal["codigo"], indice_codigos)
+    em_plano = pos_plano >= 0
+    soma_d = acumula_por_conta(
+        lancamentos["conta_debito"], valores, indice_codigos, len(bal)
+    )
+    soma_c = acumula_por_conta(
+        lancamentos["conta_credito"], valores, indice_codigos, len(bal)
+    )
+    d = np.ascontiguousarray(np.where(em_plano, soma_d[pos_plano], 0.0), dtype=np.float64)
+    c = np.ascontiguousarray(np.where(em_plano, soma_c[pos_plano], 0.0), dtype=np.float64)
+    bal["debito"] = d
+    bal["credito"] = c
 
     # Cálculo dos saldos de acordo com a natureza da conta
-    saldos = []
-    saldo_dev = []
-    saldo_cred = []
-    for _, row in bal.iterrows():
-        if row["natureza"] == "Devedora":
-            s = row["debito"] - row["credito"]
-            sd = max(s, 0)
-            sc = max(-s, 0)
-        else:  # Credora
-            s = row["credito"] - row["debito"]
-            sc = max(s, 0)
-            sd = max(-s, 0)
-        saldos.append(s)
-        saldo_dev.append(sd)
-        saldo_cred.append(sc)
-
-    bal["saldo"] = saldos
-    bal["saldo_devedor"] = saldo_dev
-    bal["saldo_credor"] = saldo_cred
-    return bal
-
-
-def calcula_dre(balancete: pd.DataFrame) -> pd.DataFrame:
-    """Monta DRE simplificada a partir do balancete."""
-    receitas = balancete[balancete["grupo"] == "Resultado - Receita"].copy()
-    despesas = balancete[balancete["grupo"] == "Resultado - Despesa"].copy()
-
-    receitas["valor"] = receitas["saldo_credor"]
-    despesas["valor"] = despesas["saldo_devedor"]
-
-    total_receitas = receitas["valor"].sum()
-    total_despesas = despesas["valor"].sum()
-    lucro_liquido = total_receitas - total_despesas
+    devedora = (bal["natureza"] == "Devedora").to_numpy()
+    s = np.where(devedora, d - c, c - d)
+
+    bal["saldo"] = s
+    bal["saldo_devedor"] = np.where(devedora, np.maximum(s, 0), np.maximum(-s, 0))
+    bal["saldo_credor"] = np.where(devedora, np.maximum(-s, 0), np.maximum(s, 0))
+    return bal, float(d.sum()), float(c.sum())
+
+
+def split_balancete_by_grupo(balancete: pd.DataFrame) -> dict:
+    """Separa o balancete em um DataFrame por grupo de contas."""
+    grupos = {g: balancete.iloc[[]] for g in GRUPOS}
+    indices = balancete.groupby("grupo", sort=False, observed=True).indices
+    for g, idx in indices.items():
+        grupos[g] = balancete.iloc[idx]
+    return grupos
+
+
+def totais_por_grupo(balancete: pd.DataFrame, codigos_grupo: np.ndarray) -> tuple:
+    """Soma os saldos devedores e credores do balancete por grupo."""
+    validos = codigos_grupo >= 0
+    codigos = codigos_grupo[validos]
+    devedor = np.bincount(
+        codigos,
+        weights=balancete["saldo_devedor"].to_numpy()[validos],
+        minlength=len(GRUPOS),
+    )
+    credor = np.bincount(
+        codigos,
+        weights=balancete["saldo_credor"].to_numpy()[validos],
+        minlength=len(GRUPOS),
+    )
+    return dict(zip(GRUPOS, devedor.tolist())), dict(zip(GRUPOS, credor.tolist()))
+
 
-    linhas = []
-    linhas.append(("Receitas", "", total_receitas))
-    linhas.append(("(-) Despesas", "", -total_despesas))
-    linhas.append(("= Lucro / Prejuízo do Período", "", lucro_liquido))
+def calcula_dre(total_receitas: float, total_despesas: float) -> pd.DataFrame:
+    """Monta DRE simplificada a partir dos totais de receitas e despesas."""
+    lucro_liquido = total_receitas - total_despesas
 
-    dre = pd.DataFrame(linhas, columns=["descrição", "detalhe", "valor"])
+    dre = pd.DataFrame(
+        {
+            "descrição": np.array(
+                ["Receitas", "(-) Despesas", "= Lucro / Prejuízo do Período"],
+                dtype=object,
+            ),
+            "detalhe": np.array(["", "", ""], dtype=object),
+            "valor": np.array(
+                [total_receitas, -total_despesas, lucro_liquido], dtype="float64"
+            ),
+        }
+    )
     return dre, lucro_liquido
 
 
-def calcula_balanco(balancete: pd.DataFrame) -> dict:
+def calcula_balanco(grupos: dict) -> dict:
     """Retorna dicionário com DataFrames do Balanço Patrimonial."""
-    ativo = balancete[balancete["grupo"] == "Ativo"].copy()
-    passivo = balancete[balancete["grupo"] == "Passivo"].copy()
-    pl = balancete[balancete["grupo"] == "Patrimônio Líquido"].copy()
-
     # Considera saldos devedores para Ativo e credores para Passivo/PL
-    ativo["valor"] = ativo["saldo_devedor"]
-    passivo["valor"] = passivo["saldo_credor"]
-    pl["valor"] = pl["saldo_credor"]
+    ativo = grupos["Ativo"][["codigo", "conta", "saldo_devedor"]].rename(
+        columns={"saldo_devedor": "valor"}
+    )
+    passivo = grupos["Passivo"][["codigo", "conta", "saldo_credor"]].rename(
+        columns={"saldo_credor": "valor"}
+    )
+    pl = grupos["Patrimônio Líquido"][["codigo", "conta", "saldo_credor"]].rename(
+        columns={"saldo_credor": "valor"}
+    )
 
     return {
-        "ativo": ativo[["codigo", "conta", "valor"]],
-        "passivo": passivo[["codigo", "conta", "valor"]],
-        "pl": pl[["codigo", "conta", "valor"]],
+        "ativo": ativo,
+        "passivo": passivo,
+        "pl": pl,
     }
 
 
 def calcula_fluxo_caixa_direto(
-    plano_contas: pd.DataFrame, lancamentos: pd.DataFrame
+    plano_contas: pd.DataFrame, lancamentos: pd.DataFrame, indice_codigos: dict
 ) -> pd.DataFrame:
     """Fluxo de caixa pelo método direto (simplificado)."""
     if lancamentos.empty:
-        return pd.DataFrame(columns=["tipo", "grupo_contraparte", "entrada", "saida"])
-
-    contas_caixa = plano_contas[plano_contas["eh_caixa"]]["codigo"].tolist()
-    plano = plano_contas.set_index("codigo")
+        return pd.DataFrame(
+            columns=["tipo", "grupo_contraparte", "entrada", "saida", "saldo"]
+        )
 
-    linhas = []
+    # Atributos por posição no plano; a última posição (-1) é a conta não cadastrada
+    eh_caixa = np.append(plano_contas["eh_caixa"].eq(True).to_numpy(), False)
+    grupo = np.append(
+        plano_contas["grupo"].astype(object).fillna(CONTA_NAO_CADASTRADA).to_numpy(),
+        CONTA_NAO_CADASTRADA,
+    )
 
-    for _, l in lancamentos.iterrows():
-        deb = l["conta_debito"]
-        cred = l["conta_credito"]
-        valor = l["valor"]
+    pos_deb = posicoes_no_plano(lancamentos["conta_debito"], indice_codigos)
+    pos_cred = posicoes_no_plano(lancamentos["conta_credito"], indice_codigos)
+    valores = lancamentos["valor"].to_numpy(dtype=np.float64)
 
-        if deb in contas_caixa and cred not in contas_caixa:
-            grupo = plano.loc[cred, "grupo"]
-            linhas.append(("Entrada de Caixa", grupo, valor, 0.0))
-        elif cred in contas_caixa and deb not in contas_caixa:
-            grupo = plano.loc[deb, "grupo"]
-            linhas.append(("Saída de Caixa", grupo, 0.0, valor))
+    deb_caixa = eh_caixa[pos_deb]
+    cred_caixa = eh_caixa[pos_cred]
+    mask_entrada = deb_caixa & ~cred_caixa
+    mask_saida = cred_caixa & ~deb_caixa
 
-    if not linhas:
-        return pd.DataFrame(columns=["tipo", "grupo_contraparte", "entrada", "saida"])
+    if not (mask_entrada.any() or mask_saida.any()):
+        return pd.DataFrame(
+            columns=["tipo", "grupo_contraparte", "entrada", "saida", "saldo"]
+        )
 
-    df = pd.DataFrame(
-        linhas, columns=["tipo", "grupo_contraparte", "entrada", "saida"]
+    # Contas removidas do plano continuam no fluxo, com rótulo explícito
+    entradas = pd.DataFrame(
+        {
+            "tipo": "Entrada de Caixa",
+            "grupo_contraparte": grupo[pos_cred[mask_entrada]],
+            "entrada": valores[mask_entrada],
+            "saida": 0.0,
+        }
+    )
+    saidas = pd.DataFrame(
+        {
+            "tipo": "Saída de Caixa",
+            "grupo_contraparte": grupo[pos_deb[mask_saida]],
+            "entrada": 0.0,
+            "saida": valores[mask_saida],
+        }
     )
+
+    df = pd.concat([entradas, saidas], ignore_index=True)
     resumo = (
-        df.groupby(["tipo", "grupo_contraparte"], as_index=False)[["entrada", "saida"]]
+        df.groupby(["tipo", "grupo_contraparte"], as_index=False, observed=True)[["entrada", "saida"]]
         .sum()
         .sort_values(["tipo", "grupo_contraparte"])
     )
+    resumo["saldo"] = resumo["entrada"] - resumo["saida"]
     return resumo
 
 
@@ -178,31 +326,70 @@ def calcula_fluxo_caixa_indireto(
 ) -> pd.DataFrame:
     """Fluxo de caixa indireto bem simplificado, apenas para fins didáticos."""
     # Variação de caixa: saldo final de contas de caixa
-    caixa = balancete[balancete["eh_caixa"]].copy()
-    caixa["valor"] = caixa["saldo"]
-    variacao_caixa = caixa["valor"].sum()
+    variacao_caixa = balancete.loc[balancete["eh_caixa"], "saldo"].sum()
 
     # Caixa líquido de operações via método direto
     if fluxo_direto.empty:
         caixa_oper = 0.0
     else:
-        fluxo_direto["saldo"] = fluxo_direto["entrada"] - fluxo_direto["saida"]
         caixa_oper = fluxo_direto["saldo"].sum()
 
     # Neste modelo simples, supomos que toda variação de caixa é operacional.
     # Ajuste do capital de giro = Caixa Operacional - Lucro Líquido
     ajuste_capital_giro = caixa_oper - lucro_liquido
 
-    linhas = [
-        ("Lucro / Prejuízo do Período", lucro_liquido),
-        ("(+/-) Ajustes no capital de giro (simplificado)", ajuste_capital_giro),
-        ("= Caixa líquido das atividades operacionais", caixa_oper),
-        ("Variação de Caixa no Período", variacao_caixa),
-    ]
-    df = pd.DataFrame(linhas, columns=["descrição", "valor"])
+    df = pd.DataFrame(
+        {
+            "descrição": np.array(
+                [
+                    "Lucro / Prejuízo do Período",
+                    "(+/-) Ajustes no capital de giro (simplificado)",
+                    "= Caixa líquido das atividades operacionais",
+                    "Variação de Caixa no Período",
+                ],
+                dtype=object,
+            ),
+            "valor": np.array(
+                [lucro_liquido, ajuste_capital_giro, caixa_oper, variacao_caixa],
+                dtype="float64",
+            ),
+        }
+    )
     return df
 
 
+@st.cache_data(show_spinner=False)
+def compute_all(
+    plano_contas: pd.DataFrame, lancamentos: pd.DataFrame, indice_codigos: dict
+) -> SimpleNamespace:
+    """Calcula todas as demonstrações de uma vez para reaproveitar entre as páginas."""
+    balancete, total_debitos, total_creditos = calcula_balancete(
+        plano_contas, lancamentos, indice_codigos
+    )
+    # Grupo de cada conta resolvido uma única vez para todos os totais
+    codigos_grupo = pd.Categorical(balancete["grupo"], categories=GRUPOS).codes
+    devedor, credor = totais_por_grupo(balancete, codigos_grupo)
+    dre, lucro = calcula_dre(credor["Resultado - Receita"], devedor["Resultado - Despesa"])
+    bp = calcula_balanco(split_balancete_by_grupo(balancete))
+    fluxo_direto = calcula_fluxo_caixa_direto(
+        plano_contas, lancamentos, indice_codigos
+    )
+    fluxo_indireto = calcula_fluxo_caixa_indireto(balancete, fluxo_direto, lucro)
+    return SimpleNamespace(
+        balancete=balancete,
+        total_debitos=total_debitos,
+        total_creditos=total_creditos,
+        dre=dre,
+        lucro=lucro,
+        bp=bp,
+        total_ativo=devedor["Ativo"],
+        total_passivo=credor["Passivo"],
+        total_pl=credor["Patrimônio Líquido"],
+        fluxo_direto=fluxo_direto,
+        fluxo_indireto=fluxo_indireto,
+    )
+
+
 # -------------------------------------------------------------------
 # INTERFACE
 # -------------------------------------------------------------------
@@ -221,7 +408,6 @@ menu = st.sidebar.radio(
 )
 
 plano_contas = st.session_state["plano_contas"]
-lancamentos = st.session_state["lancamentos"]
 
 # -------------------------------------------------------------------
 # 1. APRESENTAÇÃO
@@ -268,7 +454,9 @@ Aqui você pode **visualizar e ajustar** o plano de contas usado pelo sistema.
         key="editor_plano_contas",
     )
 
-    st.session_state["plano_contas"] = edited
+    if not edited.equals(plano_contas):
+        st.session_state["plano_contas"] = edited
+        st.session_state["plano_version"] += 1
     st.success("Plano de contas atualizado na memória da aplicação.")
 
 # -------------------------------------------------------------------
@@ -286,9 +474,18 @@ elif menu == "Lançamentos":
             historico = col2.text_input("Histórico", "")
 
             col3, col4 = st.columns(2)
-            contas_combo = plano_contas["codigo"] + " - " + plano_contas["conta"]
-            conta_debito = col3.selectbox("Conta de Débito", contas_combo)
-            conta_credito = col4.selectbox("Conta de Crédito", contas_combo)
+            conta_por_codigo = mapa_conta_por_codigo(plano_contas)
+            codigos = plano_contas["codigo"].dropna().tolist()
+
+            def rotulo_conta(codigo):
+                return f"{codigo} - {conta_por_codigo[codigo]}"
+
+            conta_debito = col3.selectbox(
+                "Conta de Débito", codigos, format_func=rotulo_conta
+            )
+            conta_credito = col4.selectbox(
+                "Conta de Crédito", codigos, format_func=rotulo_conta
+            )
 
             valor = st.number_input(
                 "Valor do lançamento",
@@ -300,41 +497,25 @@ elif menu == "Lançamentos":
             submitted = st.form_submit_button("Incluir lançamento")
 
         if submitted:
-            cod_deb = conta_debito.split(" - ")[0]
-            cod_cred = conta_credito.split(" - ")[0]
-            novo = pd.DataFrame(
-                [
-                    {
-                        "data": data_lcto,
-                        "historico": historico,
-                        "conta_debito": cod_deb,
-                        "conta_credito": cod_cred,
-                        "valor": float(valor),
-                    }
-                ]
-            )
-            st.session_state["lancamentos"] = pd.concat(
-                [st.session_state["lancamentos"], novo],
-                ignore_index=True,
+            st.session_state["lancamentos_rows"].append(
+                {
+                    "data": data_lcto,
+                    "historico": historico,
+                    "conta_debito": conta_debito,
+                    "conta_credito": conta_credito,
+                    "valor": float(valor),
+                }
             )
             st.success("Lançamento incluído com sucesso!")
 
         st.subheader("Lançamentos do período")
-        if st.session_state["lancamentos"].empty:
+        if not st.session_state["lancamentos_rows"]:
             st.info("Ainda não há lançamentos registrados.")
         else:
-            st.dataframe(st.session_state["lancamentos"], use_container_width=True)
+            st.dataframe(get_lancamentos_df(), use_container_width=True)
 
         if st.button("Limpar todos os lançamentos"):
-            st.session_state["lancamentos"] = pd.DataFrame(
-                columns=[
-                    "data",
-                    "historico",
-                    "conta_debito",
-                    "conta_credito",
-                    "valor",
-                ]
-            )
+            st.session_state["lancamentos_rows"] = []
             st.success("Todos os lançamentos foram apagados.")
 
 # -------------------------------------------------------------------
@@ -343,10 +524,13 @@ elif menu == "Lançamentos":
 elif menu == "Balancete":
     st.title("Balancete de Verificação")
 
-    if lancamentos.empty:
+    if not st.session_state["lancamentos_rows"]:
         st.info("Não há lançamentos para gerar o balancete.")
     else:
-        balancete = calcula_balancete(plano_contas, lancamentos)
+        demonstracoes = compute_all(
+            plano_contas, get_lancamentos_df(), get_indice_codigos()
+        )
+        balancete = demonstracoes.balancete
         st.dataframe(balancete[
             [
                 "codigo",
@@ -359,8 +543,8 @@ elif menu == "Balancete":
             ]
         ], use_container_width=True)
 
-        total_debitos = balancete["debito"].sum()
-        total_creditos = balancete["credito"].sum()
+        total_debitos = demonstracoes.total_debitos
+        total_creditos = demonstracoes.total_creditos
         st.markdown("---")
         col1, col2 = st.columns(2)
         col1.metric("Total de Débitos", f"{total_debitos:,.2f}")
@@ -377,11 +561,16 @@ elif menu == "Balancete":
 elif menu == "Balanço Patrimonial":
     st.title("Balanço Patrimonial")
 
-    if lancamentos.empty:
+    if not st.session_state["lancamentos_rows"]:
         st.info("Não há lançamentos para montar o Balanço Patrimonial.")
     else:
-        balancete = calcula_balancete(plano_contas, lancamentos)
-        bp = calcula_balanco(balancete)
+        demonstracoes = compute_all(
+            plano_contas, get_lancamentos_df(), get_indice_codigos()
+        )
+        bp = demonstracoes.bp
+        total_ativo = demonstracoes.total_ativo
+        total_passivo = demonstracoes.total_passivo
+        total_pl = demonstracoes.total_pl
 
         col_esq, col_dir = st.columns(2)
 
@@ -392,7 +581,7 @@ elif menu == "Balanço Patrimonial":
             else:
                 st.dataframe(bp["ativo"], use_container_width=True)
                 st.markdown(
-                    f"**Total do Ativo:** {bp['ativo']['valor'].sum():,.2f}"
+                    f"**Total do Ativo:** {total_ativo:,.2f}"
                 )
 
         with col_dir:
@@ -402,7 +591,7 @@ elif menu == "Balanço Patrimonial":
             else:
                 st.dataframe(bp["passivo"], use_container_width=True)
                 st.markdown(
-                    f"**Total do Passivo:** {bp['passivo']['valor'].sum():,.2f}"
+                    f"**Total do Passivo:** {total_passivo:,.2f}"
                 )
 
             st.subheader("Patrimônio Líquido")
@@ -411,11 +600,10 @@ elif menu == "Balanço Patrimonial":
             else:
                 st.dataframe(bp["pl"], use_container_width=True)
                 st.markdown(
-                    f"**Total do Patrimônio Líquido:** {bp['pl']['valor'].sum():,.2f}"
+                    f"**Total do Patrimônio Líquido:** {total_pl:,.2f}"
                 )
 
-        total_ativo = bp["ativo"]["valor"].sum()
-        total_ppl = bp["passivo"]["valor"].sum() + bp["pl"]["valor"].sum()
+        total_ppl = total_passivo + total_pl
 
         st.markdown("---")
         st.metric("Total do Ativo", f"{total_ativo:,.2f}")
@@ -427,11 +615,13 @@ elif menu == "Balanço Patrimonial":
 elif menu == "Demonstração do Resultado":
     st.title("Demonstração do Resultado do Exercício (DRE)")
 
-    if lancamentos.empty:
+    if not st.session_state["lancamentos_rows"]:
         st.info("Não há lançamentos para montar a DRE.")
     else:
-        balancete = calcula_balancete(plano_contas, lancamentos)
-        dre, lucro = calcula_dre(balancete)
+        demonstracoes = compute_all(
+            plano_contas, get_lancamentos_df(), get_indice_codigos()
+        )
+        dre, lucro = demonstracoes.dre, demonstracoes.lucro
 
         st.dataframe(dre, use_container_width=True)
         st.markdown("---")
@@ -443,15 +633,14 @@ elif menu == "Demonstração do Resultado":
 elif menu == "Fluxo de Caixa":
     st.title("Fluxo de Caixa")
 
-    if lancamentos.empty:
+    if not st.session_state["lancamentos_rows"]:
         st.info("Não há lançamentos para gerar o fluxo de caixa.")
     else:
-        balancete = calcula_balancete(plano_contas, lancamentos)
-        fluxo_direto = calcula_fluxo_caixa_direto(plano_contas, lancamentos)
-        dre, lucro = calcula_dre(balancete)
-        fluxo_indireto = calcula_fluxo_caixa_indireto(
-            balancete, fluxo_direto, lucro
+        demonstracoes = compute_all(
+            plano_contas, get_lancamentos_df(), get_indice_codigos()
         )
+        fluxo_direto = demonstracoes.fluxo_direto
+        fluxo_indireto = demonstracoes.fluxo_indireto
 
         col1, col2 = st.columns(2)
 
@@ -460,9 +649,8 @@ elif menu == "Fluxo de Caixa":
             if fluxo_direto.empty:
                 st.write("Nenhuma movimentação de contas de caixa foi identificada.")
             else:
-                fluxo_direto["saldo"] = fluxo_direto["entrada"] - fluxo_direto["saida"]
                 st.dataframe(fluxo_direto, use_container_width=True)
-                caixa_oper = fluxo_direto["saldo"].sum()
+                caixa_oper = fluxo_direto["saldo"].to_numpy().sum()
                 st.markdown(
                     f"**Caixa líquido das atividades operacionais (direto):** {caixa_oper:,.2f}"
                 )